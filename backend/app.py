@@ -1,13 +1,32 @@
 # backend/app.py
 
 import os
+import asyncio
 import requests
+import aiohttp
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
-import google.generativeai as genai
-from datetime import datetime, timedelta, date
+import ahocorasick
+from lxml import etree, html as lxml_html
+from io import BytesIO
+from datetime import datetime, timedelta, date, timezone
+from email.utils import parsedate_to_datetime
 import re
-from supabase import create_client, Client
-from bs4 import BeautifulSoup
+import logging
+import json
+import math
+import hashlib
+import time
+import calendar
+import functools
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from supabase import create_client
+
+logger = logging.getLogger(__name__)
 
 # --- Configuration (Get these from your environment variables) ---
 NEWS_API_KEY = os.environ.get("NEWS_API_KEY")
@@ -15,154 +34,511 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY") # service_role key
 SCRAPINGBEE_API_KEY = os.environ.get("SCRAPINGBEE_API_KEY")
+AGENT_STATE_BUCKET = os.environ.get("AGENT_STATE_BUCKET", "agent-state") # Supabase Storage bucket for run-to-run state
+FAST_RSS_PARSE = os.environ.get("FAST_RSS_PARSE", "true").lower() == "true" # Use lxml for plain RSS 2.0 feeds
+GEMINI_MODEL_NAME = os.environ.get("GEMINI_MODEL_NAME") # e.g. "gemini-1.5-flash"; skips model discovery
+
+# --- Shared HTTP Session ---
+# A single session keeps connections alive between requests to the same host,
+# saving a TCP + TLS handshake on every synchronous call (feeds and News API go
+# through the aiohttp session in fetch_all_articles instead).
+# Transient failures (connection errors, 429 and 5xx) are retried with exponential backoff.
+HTTP_MAX_ATTEMPTS = 3
+HTTP_BACKOFF_FACTOR = 0.3
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=HTTP_MAX_ATTEMPTS - 1, backoff_factor=HTTP_BACKOFF_FACTOR, status_forcelist=HTTP_RETRY_STATUSES)
+))
+
+# --- Article Record ---
+@dataclass(slots=True)
+class Article:
+    """One fetched article as it flows through the pipeline; rows are built from it only at the Supabase boundary."""
+    # News API can return null fields, so everything but source and keywords may be None.
+    source: str
+    title: str | None
+    url: str | None
+    description: str | None
+    published_date: str | None
+    keywords_matched: list[str]
+    published_ts: int | None = None # epoch seconds, when the feed parser already parsed the date
+    full_content: str | None = None
 
 # --- Helper for Date Parsing ---
+# Timezone-aware sentinel so unparseable dates still sort against real ones.
+MIN_DATETIME = datetime.min.replace(tzinfo=timezone.utc)
+
+@functools.lru_cache(maxsize=2048)
 def _parse_date_string(date_string):
     """
-    Attempts to parse a date string into a datetime object using common formats.
-    Returns datetime.min if parsing fails.
+    Attempts to parse a date string into a timezone-aware datetime object.
+    Handles RFC 822 dates (RSS) and ISO 8601 dates (News API); naive results are taken as UTC.
+    Returns MIN_DATETIME if parsing fails.
+    Memoized: the same published_date is looked up by dedup, sorting and storage, and
+    repeat calls neither re-parse nor re-log the warning.
     """
     if not date_string:
-        return datetime.min
+        return MIN_DATETIME
 
-    formats = [
-        '%Y-%m-%dT%H:%M:%SZ',
-        '%Y-%m-%dT%H:%M:%S%z',
-        '%a, %d %b %Y %H:%M:%S %z',
-        '%a, %d %b %Y %H:%M:%S',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d',
-    ]
-
-    cleaned_date_string = date_string.replace('Z', '+00:00').strip()
-    cleaned_date_string = re.sub(r' (UTC|GMT)$', ' +0000', cleaned_date_string, flags=re.IGNORECASE)
-
-    for fmt in formats:
+    # fromisoformat is implemented in C and rejects non-ISO input quickly, so it goes
+    # first; the pure-Python RFC 822 parser only runs when it has to.
+    dt_obj = None
+    try:
+        dt_obj = datetime.fromisoformat(date_string.strip().replace('Z', '+00:00'))
+    except ValueError:
         try:
-            dt_obj = datetime.strptime(cleaned_date_string, fmt)
-            if dt_obj.tzinfo is None:
-                return dt_obj.replace(tzinfo=datetime.timezone.utc)
-            return dt_obj
-        except ValueError:
+            dt_obj = parsedate_to_datetime(date_string)
+        except (TypeError, ValueError, IndexError):
             pass
 
-    print(f"Warning: Could not parse date string '{date_string}' with any known format.")
-    return datetime.min
+    if dt_obj is None:
+        logger.warning("Could not parse date string '%s' with any known format.", date_string)
+        return MIN_DATETIME
+    if dt_obj.tzinfo is None:
+        return dt_obj.replace(tzinfo=timezone.utc)
+    return dt_obj
+
+def _published_datetime(article):
+    """
+    Returns an article's publish time as an aware datetime. Uses the epoch timestamp
+    captured from feedparser's published_parsed when present, else parses the date string.
+    """
+    if article.published_ts is not None:
+        return datetime.fromtimestamp(article.published_ts, timezone.utc)
+    return _parse_date_string(article.published_date)
+
+def _sort_by_published_date(articles):
+    """
+    Returns the articles sorted newest first, parsing each date exactly once
+    (decorate-sort-undecorate).
+    """
+    decorated = [(_published_datetime(article), article) for article in articles]
+    decorated.sort(key=lambda t: t[0], reverse=True)
+    return [article for _, article in decorated]
+
+# --- Helpers for URL Deduplication ---
+TRACKING_PARAM_PREFIXES = ('utm_', 'fbclid', 'gclid')
+
+def _canonicalize_url(url):
+    """
+    Normalizes a URL so trivially different links to the same article compare equal:
+    lowercases scheme and host, drops the fragment and tracking parameters,
+    sorts the remaining query parameters and strips a trailing slash.
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+# --- Helpers for Near-Duplicate Detection ---
+# Titles are compared as word sets. A syndicated copy usually adds words ("UPDATE:",
+# " - The Globe and Mail", "... today") without changing any, so the shorter title must be
+# fully contained in the longer one; the Jaccard floor stops a short title from absorbing a
+# much longer one. One-word swaps ("rises"/"falls", "Ontario"/"Alberta") fail containment.
+TITLE_MIN_CONTAINMENT = 1.0
+TITLE_MIN_JACCARD = 0.5
+TITLE_MIN_TOKENS = 4 # shorter titles are too generic to collapse
+
+def _normalize_title(title):
+    """Lowercases a title, turns punctuation into spaces and collapses whitespace."""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', (title or '').lower()).split())
+
+def _title_tokens(title):
+    """Returns the set of words in a normalized title, with plural 's' folded ("projects" == "project")."""
+    return frozenset(
+        token[:-1] if len(token) > 3 and token.endswith('s') and not token.endswith('ss') else token
+        for token in title.split()
+    )
+
+def _is_near_duplicate(tokens_a, tokens_b):
+    """True if two title token sets pass both the containment and the Jaccard test."""
+    size_a, size_b = len(tokens_a), len(tokens_b)
+    smaller, larger = (size_a, size_b) if size_a <= size_b else (size_b, size_a)
+    if smaller < TITLE_MIN_TOKENS or smaller < TITLE_MIN_JACCARD * larger:
+        return False # Jaccard can be at most smaller / larger
+    common = len(tokens_a & tokens_b)
+    return (common >= TITLE_MIN_CONTAINMENT * smaller
+            and common >= TITLE_MIN_JACCARD * (size_a + size_b - common))
+
+def _collapse_near_duplicates(articles):
+    """
+    Groups articles whose titles are near duplicates (see _is_near_duplicate; e.g. the same
+    story syndicated under different URLs) and keeps the earliest-published article of
+    each group, in the position of the group's first article.
+    Only used to pick the briefing's articles; storage keeps every distinct URL.
+    """
+    groups = [] # [title tokens, kept article, kept article's published datetime]
+    for article in articles:
+        normalized_title = _normalize_title(article.title)
+        if not normalized_title or normalized_title == 'no title':
+            groups.append([None, article, None]) # nothing meaningful to compare
+            continue
+        tokens = _title_tokens(normalized_title)
+        published = _published_datetime(article)
+        for group in groups:
+            if group[0] is not None and _is_near_duplicate(group[0], tokens):
+                # Unparseable dates (MIN_DATETIME) never displace a real one.
+                if published != MIN_DATETIME and (group[2] == MIN_DATETIME or published < group[2]):
+                    group[1], group[2] = article, published
+                break
+        else:
+            groups.append([tokens, article, published])
+    return [group[1] for group in groups]
+
+def _deduplicate_articles(articles):
+    """Returns the articles with canonical-URL duplicates removed, keeping the first seen."""
+    seen = {}
+    for article in articles:
+        seen.setdefault(_canonicalize_url(article.url), article)
+    return list(seen.values())
+
+# --- Bloom Filter of Already-Ingested Articles ---
+SEEN_ARTICLES_PATH = "seen_articles.bloom"
+SEEN_ARTICLES_CAPACITY = 100_000
+SEEN_ARTICLES_ERROR_RATE = 0.001
+
+class SeenArticleFilter:
+    """
+    Fixed-size Bloom filter over seen-article keys (canonical URL plus content hash,
+    see _seen_key); the methods take any string key. Lookups can return false
+    positives (at roughly the configured error rate) but never false negatives.
+    """
+
+    def __init__(self, capacity=SEEN_ARTICLES_CAPACITY, error_rate=SEEN_ARTICLES_ERROR_RATE, data=None):
+        self.num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        num_bytes = (self.num_bits + 7) // 8
+        if data is not None and len(data) == num_bytes:
+            self.bits = bytearray(data)
+        else:
+            self.bits = bytearray(num_bytes)
+
+    def _positions(self, key):
+        # Double hashing: derive every probe position from one 128-bit digest.
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def to_bytes(self):
+        return bytes(self.bits)
 
 # --- Configure Google Gemini ---
+# Preferred models, best first: 1.5-flash for efficiency, then gemini-pro (older, but
+# usually available), then 1.5-pro. Any other 'generateContent' model is the last resort.
+GEMINI_MODEL_PRIORITY = {
+    'models/gemini-1.5-flash': 0,
+    'models/gemini-pro': 1,
+    'models/gemini-1.5-pro': 2,
+}
+
+@functools.lru_cache(maxsize=1)
 def get_gemini_model():
     """
     Configures Google Gemini and finds a suitable model, prioritizing 'gemini-1.5-flash'.
+    Called lazily on first use; the selection (including None) is cached for the process.
+    Setting GEMINI_MODEL_NAME skips the list_models() call.
     """
     if not GEMINI_API_KEY:
-        print("GEMINI_API_KEY is not set. Cannot configure Gemini.")
+        logger.warning("GEMINI_API_KEY is not set. Cannot configure Gemini.")
         return None
 
+    # Imported lazily: the SDK is heavy and only needed when Gemini is configured.
+    import google.generativeai as genai
     genai.configure(api_key=GEMINI_API_KEY)
-    
+
+    if GEMINI_MODEL_NAME:
+        logger.info("Using configured Gemini model: %s (discovery skipped).", GEMINI_MODEL_NAME)
+        return genai.GenerativeModel(GEMINI_MODEL_NAME)
+
     available_models = []
     try:
         available_models = list(genai.list_models())
     except Exception as e:
-        print(f"Error listing Gemini models: {e}. Check API key validity and network access.")
+        logger.error("Error listing Gemini models: %s. Check API key validity and network access.", e)
         return None
 
-    # Priority 1: Try 'models/gemini-1.5-flash' for efficiency
-    for m in available_models:
-        if m.name == 'models/gemini-1.5-flash' and 'generateContent' in m.supported_generation_methods:
-            print("Found suitable Gemini model: models/gemini-1.5-flash (preferred).")
-            return genai.GenerativeModel('gemini-1.5-flash')
-            
-    # Priority 2: Fallback to 'models/gemini-pro' (older, but usually available)
+    # One pass over the listing: keep the best-ranked preferred model, and remember the
+    # first other 'generateContent' model as the general fallback.
+    best_model, best_rank, any_model = None, len(GEMINI_MODEL_PRIORITY), None
     for m in available_models:
-        if m.name == 'models/gemini-pro' and 'generateContent' in m.supported_generation_methods:
-            print("Found suitable Gemini model: models/gemini-pro (fallback).")
-            return genai.GenerativeModel('gemini-pro')
+        if 'generateContent' not in m.supported_generation_methods:
+            continue
+        rank = GEMINI_MODEL_PRIORITY.get(m.name)
+        if rank is not None and rank < best_rank:
+            best_model, best_rank = m, rank
+            if rank == 0:
+                break
+        elif any_model is None:
+            any_model = m
 
-    # Priority 3: Fallback to 'models/gemini-1.5-pro' if others aren't available or suitable
-    for m in available_models:
-        if m.name == 'models/gemini-1.5-pro' and 'generateContent' in m.supported_generation_methods:
-            print("Found suitable Gemini model: models/gemini-1.5-pro (general fallback).")
-            return genai.GenerativeModel('gemini-1.5-pro')
+    if best_model:
+        logger.info("Found suitable Gemini model: %s (priority %s).", best_model.name, best_rank + 1)
+        return genai.GenerativeModel(best_model.name.split('/')[-1])
 
-    # Priority 4: General fallback - find ANY model that supports generateContent
-    print("No specific preferred models found. Searching for any 'generateContent' supporting model.")
-    for m in available_models:
-        if 'generateContent' in m.supported_generation_methods:
-            print(f"Found suitable Gemini model: {m.name} (any available).")
-            return genai.GenerativeModel(m.name.split('/')[-1])
+    if any_model:
+        logger.info("No specific preferred models found. Found suitable Gemini model: %s (any available).", any_model.name)
+        return genai.GenerativeModel(any_model.name.split('/')[-1])
 
-    print("No suitable Gemini model found that supports 'generateContent'. AI analysis will be skipped.")
+    logger.warning("No suitable Gemini model found that supports 'generateContent'. AI analysis will be skipped.")
     return None
 
-model = get_gemini_model() # Initialize the model dynamically
-
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# --- Supabase Client ---
+@functools.lru_cache(maxsize=1)
+def get_supabase_client():
+    """
+    Creates the Supabase client on first use and caches it for the process.
+    Returns None (logging once) when SUPABASE_URL or SUPABASE_KEY is missing,
+    in which case every storage step is skipped.
+    """
+    if not (SUPABASE_URL and SUPABASE_KEY):
+        logger.warning("SUPABASE_URL or SUPABASE_KEY is not set. Supabase storage will be skipped.")
+        return None
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # --- Keywords for Filtering (Case-insensitive) ---
 # TEMPORARILY SIMPLIFIED KEYWORDS FOR DEBUGGING "0 articles found" ISSUE
 KEYWORDS = [
     "Canada", "Canadian", "Energy", "clean energy", "economy", "Ontario", "Alberta", "Quebec", "Toronto", "Vancouver"
 ]
-KEYWORD_PATTERN = re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in KEYWORDS) + r')\b', re.IGNORECASE)
-
-def fetch_articles_from_rss():
-    """Fetches articles from the configured RSS feeds."""
-    all_articles = []
-    print("Fetching articles from RSS feeds...")
-    RSS_FEEDS = [
-        {"name": "Globe and Mail - Business", "url": "https://www.theglobeandmail.com/business/feed/"},
-        {"name": "Toronto Star - Business", "url": "https://www.thestar.com/business/feed/"},
-        {"name": "National Observer", "url": "https://www.nationalobserver.com/rss"},
-        # --- {"name": "Financial Post", "url": "https://financialpost.com/feed/"}, ---
-        {"name": "Ontario Newsroom", "url": "https://news.ontario.ca/en/feed"},
-        {"name": "The Hub", "url": "https://thehub.ca/feed/"},
-        {"name": "The Logic", "url": "https://thelogic.co/feed/"},
-    ]
-    for feed_info in RSS_FEEDS:
+# Aho-Corasick automaton over the lowercased keywords: finds every (possibly
+# overlapping) keyword occurrence in one linear pass over the text.
+KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for _keyword in KEYWORDS:
+    KEYWORD_AUTOMATON.add_word(_keyword.lower(), _keyword)
+KEYWORD_AUTOMATON.make_automaton()
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+def _match_keywords(title, summary):
+    """Returns the sorted list of KEYWORDS found as whole words in the title or summary (case-insensitive)."""
+    # One formatted string and one lowercase copy; the automaton holds lowercased keywords.
+    blob = f'{title}\n{summary}'.lower()
+    hits = set()
+    for end, keyword in KEYWORD_AUTOMATON.iter(blob):
+        start = end - len(keyword) + 1
+        # Enforce the same word boundaries the old r'\b...\b' regexes did.
+        if start > 0 and _is_word_char(blob[start - 1]):
+            continue
+        if end + 1 < len(blob) and _is_word_char(blob[end + 1]):
+            continue
+        hits.add(keyword)
+    return sorted(hits)
+
+# --- News API Query (static, so built once at import) ---
+# TEMPORARILY SIMPLIFIED NEWSAPI QUERY FOR DEBUGGING
+NEWSAPI_TOPICS = ["clean energy", "energy", "economy"]
+NEWSAPI_QUERY = "Canada AND (" + " OR ".join(f'"{t}"' if ' ' in t else t for t in NEWSAPI_TOPICS) + ")"
+
+RSS_FEEDS = [
+    {"name": "Globe and Mail - Business", "url": "https://www.theglobeandmail.com/business/feed/"},
+    {"name": "Toronto Star - Business", "url": "https://www.thestar.com/business/feed/"},
+    {"name": "National Observer", "url": "https://www.nationalobserver.com/rss"},
+    # --- {"name": "Financial Post", "url": "https://financialpost.com/feed/"}, ---
+    {"name": "Ontario Newsroom", "url": "https://news.ontario.ca/en/feed"},
+    {"name": "The Hub", "url": "https://thehub.ca/feed/"},
+    {"name": "The Logic", "url": "https://thelogic.co/feed/"},
+]
+
+# RSS 2.0 <item> children mapped to the feedparser entry keys used below.
+RSS_ITEM_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "description": "summary",
+    "pubDate": "published",
+    "{http://purl.org/dc/elements/1.1/}date": "published",
+}
+RSS_CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded" # summary fallback, as in feedparser
+
+def _summary_to_text(summary):
+    """
+    Reduces an item description to plain text: script/style elements are dropped with
+    their content and all other markup is stripped (feedparser sanitizes instead).
+    """
+    try:
+        fragment = lxml_html.fragment_fromstring(summary, create_parent='div')
+    except (etree.ParserError, ValueError):
+        return ''
+    etree.strip_elements(fragment, 'script', 'style', with_tail=False)
+    return ' '.join(fragment.text_content().split())
+
+def _fast_parse_rss(xml_bytes):
+    """
+    Stream-parses an RSS 2.0 document with lxml, returning its items as feedparser-style
+    entries. Returns None for anything that is not RSS 2.0 (e.g. Atom or RDF feeds)
+    so the caller can fall back to feedparser.
+    Matches feedparser where ingestion depends on it: a permalink <guid> stands in for a
+    missing <link>, <content:encoded> stands in for a missing <description>, summaries
+    carry no markup, and published_parsed is filled in.
+    """
+    entries = []
+    context = etree.iterparse(BytesIO(xml_bytes), events=('start', 'end'), resolve_entities=False)
+    for event, elem in context:
+        if event == 'start':
+            if elem.getparent() is None and elem.tag != 'rss':
+                return None
+            continue
+        if elem.tag != 'item':
+            continue
+        entry = feedparser.FeedParserDict()
+        permalink = None
+        content = None
+        for child in elem:
+            if child.tag == 'guid' and child.text and child.get('isPermaLink', 'true').lower() != 'false':
+                permalink = child.text.strip()
+                continue
+            if child.tag == RSS_CONTENT_ENCODED:
+                content = content or child.text
+                continue
+            key = RSS_ITEM_FIELDS.get(child.tag)
+            if key and key not in entry and child.text:
+                entry[key] = child.text.strip()
+        if 'link' not in entry and permalink:
+            entry['link'] = permalink
+        if 'summary' not in entry and content and content.strip():
+            entry['summary'] = content.strip()
+        if 'summary' in entry:
+            entry['summary'] = _summary_to_text(entry['summary'])
+        if 'published' in entry:
+            published = _parse_date_string(entry['published'])
+            if published != MIN_DATETIME:
+                entry['published_parsed'] = published.utctimetuple()
+        entries.append(entry)
+        # Free each parsed item (and already-processed siblings) to bound memory.
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return entries
+
+def _parse_feed_entries(xml_bytes):
+    """Parses feed bytes into entries, using the lxml fast path when enabled and applicable."""
+    if FAST_RSS_PARSE:
         try:
-            feed = feedparser.parse(feed_info["url"])
-            for entry in feed.entries:
-                title = entry.title if hasattr(entry, 'title') else 'No Title'
-                link = entry.link if hasattr(entry, 'link') else '#'
-                summary = entry.summary if hasattr(entry, 'summary') else (entry.description if hasattr(entry, 'description') else 'No summary available.')
-                
-                matched_keywords = [k for k in KEYWORDS if re.search(r'\b' + re.escape(k) + r'\b', title + ' ' + summary, re.IGNORECASE)]
+            entries = _fast_parse_rss(xml_bytes)
+            if entries is not None:
+                return entries
+        except etree.XMLSyntaxError:
+            pass # feedparser copes with malformed XML better
+    return feedparser.parse(xml_bytes).entries
 
-                if matched_keywords:
-                    all_articles.append({
-                        "source": feed_info["name"],
-                        "title": title,
-                        "url": link,
-                        "description": summary,
-                        "published_date": entry.published if hasattr(entry, 'published') else 'N/A',
-                        "keywords_matched": matched_keywords,
-                        "full_content": None
-                    })
-        except Exception as e:
-            print(f"Error fetching RSS for {feed_info['name']} ({feed_info['url']}): {e}")
-    print(f"Found {len(all_articles)} articles from RSS feeds after initial keyword filter.")
+async def _fetch_one_rss_feed(session, feed_info, feed_cache=None):
+    """
+    Fetches a single RSS feed and returns its keyword-matching articles.
+    With a feed cache, a conditional GET is sent and an unchanged feed (304) yields no articles;
+    the cache entry is refreshed from the response's ETag / Last-Modified headers once the
+    body has been parsed (the handler persists the cache only after storage succeeds).
+    """
+    articles = []
+    try:
+        headers = {}
+        cached = (feed_cache or {}).get(feed_info["url"], {})
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        async with session.get(feed_info["url"], headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status == 304:
+                logger.info("RSS feed %s not modified since last run, skipping.", feed_info['name'])
+                return articles
+            response.raise_for_status()
+            content = await response.read()
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        for entry in _parse_feed_entries(content):
+            title = entry.get('title', 'No Title')
+            link = entry.get('link', '#')
+            summary = entry.get('summary') or entry.get('description') or 'No summary available.'
+            
+            matched_keywords = _match_keywords(title, summary)
+
+            if matched_keywords:
+                published_parsed = entry.get('published_parsed')
+                articles.append(Article(
+                    source=feed_info["name"],
+                    title=title,
+                    url=link,
+                    description=summary,
+                    published_date=entry.get('published', 'N/A'),
+                    keywords_matched=matched_keywords,
+                    # feedparser has already parsed the date; keep it so it is never re-parsed.
+                    published_ts=calendar.timegm(published_parsed) if published_parsed else None,
+                ))
+        if feed_cache is not None:
+            feed_cache[feed_info["url"]] = validators
+    except Exception as e:
+        logger.error("Error fetching RSS for %s (%s): %s", feed_info['name'], feed_info['url'], e)
+    return articles
+
+async def fetch_articles_from_rss(session, feed_cache=None):
+    """
+    Fetches articles from the configured RSS feeds concurrently.
+    feed_cache, if given, holds HTTP validators per feed URL and is updated in place.
+    """
+    logger.info("Fetching articles from RSS feeds...")
+    # Feed fetches are I/O-bound, so running them together turns the total latency
+    # into that of the slowest feed rather than the sum of all of them.
+    results = await asyncio.gather(*(_fetch_one_rss_feed(session, feed_info, feed_cache) for feed_info in RSS_FEEDS))
+    all_articles = [article for feed_articles in results for article in feed_articles]
+    logger.info("Found %s articles from RSS feeds after initial keyword filter.", len(all_articles))
     return all_articles
 
-def fetch_articles_from_newsapi(query="", days_back=1, language="en", max_articles=10):
+async def _get_json_with_retries(session, url, params, timeout):
+    """
+    GETs a JSON document over the aiohttp session, retrying connection errors, timeouts
+    and HTTP_RETRY_STATUSES responses with exponential backoff. Other HTTP errors
+    (e.g. 400 or 401) are raised immediately. Raises the last error.
+    """
+    for attempt in range(HTTP_MAX_ATTEMPTS):
+        try:
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status not in HTTP_RETRY_STATUSES or attempt == HTTP_MAX_ATTEMPTS - 1:
+                    response.raise_for_status()
+                    # orjson parses the raw bytes directly: no charset decode, fewer allocations.
+                    return orjson.loads(await response.read())
+                logger.warning("Got HTTP %s from %s, retrying...", response.status, url)
+        except aiohttp.ClientResponseError:
+            raise # raised by raise_for_status above: not retryable, or out of attempts
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == HTTP_MAX_ATTEMPTS - 1:
+                raise
+            logger.warning("Request to %s failed (%s), retrying...", url, e)
+        await asyncio.sleep(HTTP_BACKOFF_FACTOR * (2 ** attempt))
+
+async def fetch_articles_from_newsapi(session, query="", days_back=1, language="en", max_articles=10):
     """
     Fetches articles from News API for a given query (as a supplementary source).
-    Uses simplified query for debugging.
+    Defaults to the precomputed NEWSAPI_QUERY.
     """
     if not NEWS_API_KEY:
-        print("NEWS_API_KEY is not set, skipping News API fetch.")
+        logger.warning("NEWS_API_KEY is not set, skipping News API fetch.")
         return []
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
 
-    # TEMPORARILY SIMPLIFIED NEWSAPI QUERY FOR DEBUGGING
-    newsapi_query = "Canada AND (clean energy OR energy OR economy)" 
-
-    url = f"https://newsapi.org/v2/everything"
+    url = "https://newsapi.org/v2/everything"
     params = {
-        "q": newsapi_query,
+        "q": query or NEWSAPI_QUERY,
         "language": language,
         "from": start_date.isoformat(),
         "to": end_date.isoformat(),
@@ -172,46 +548,64 @@ def fetch_articles_from_newsapi(query="", days_back=1, language="en", max_articl
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = await _get_json_with_retries(session, url, params, timeout=30)
         if data['status'] == 'ok':
             formatted_articles = []
             for article in data['articles']:
                 title = article.get('title', 'No Title')
                 description = article.get('description', 'No description available.')
                 # Filter using the combined KEYWORDS (including geographical)
-                matched_keywords = [k for k in KEYWORDS if re.search(r'\b' + re.escape(k) + r'\b', title + ' ' + description, re.IGNORECASE)]
+                matched_keywords = _match_keywords(title, description)
 
                 if matched_keywords:
-                    formatted_articles.append({
-                        "source": article.get('source', {}).get('name', 'News API'),
-                        "title": title,
-                        "url": article.get('url', '#'),
-                        "description": description,
-                        "published_date": article.get('publishedAt', 'N/A'),
-                        "keywords_matched": matched_keywords,
-                        "full_content": None
-                    })
-                print(f"Found {len(formatted_articles)} articles from News API.")
+                    formatted_articles.append(Article(
+                        source=article.get('source', {}).get('name', 'News API'),
+                        title=title,
+                        url=article.get('url', '#'),
+                        description=description,
+                        published_date=article.get('publishedAt', 'N/A'),
+                        keywords_matched=matched_keywords,
+                    ))
+            logger.info("Found %s articles from News API.", len(formatted_articles))
             return formatted_articles
         else:
-            print(f"News API Error: {data.get('message', 'Unknown error')}")
+            logger.error("News API Error: %s", data.get('message', 'Unknown error'))
             return []
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching news from News API: {e}")
+    except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+        logger.error("Error fetching news from News API: %s", e)
         return []
 
+# Explicit compression and an identifiable client; aiohttp decompresses bodies transparently.
+FETCH_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "ai-news-agent/1.0",
+}
+
+async def fetch_all_articles(feed_cache=None):
+    """
+    Fetches RSS feeds and News API together over one aiohttp session, so all of
+    their network I/O overlaps on a single thread. Returns (rss_articles, newsapi_articles).
+    """
+    connector = aiohttp.TCPConnector(limit=16)
+    async with aiohttp.ClientSession(connector=connector, headers=FETCH_HEADERS) as session:
+        return await asyncio.gather(
+            fetch_articles_from_rss(session, feed_cache),
+            fetch_articles_from_newsapi(session),
+        )
+
+SCRAPINGBEE_MAX_BODY_BYTES = 2_000_000 # pages beyond this are truncated; article text sits well inside it
+FULL_CONTENT_MAX_CHARS = 2000 # the prompt only ever uses this much, so nothing longer is kept
+MAIN_CONTENT_CLASS_PATTERN = re.compile("body|content|article", re.I) # fallback when there is no <article>/<main>
+
 def fetch_full_article_content(url):
     """
     Fetches the full HTML content of an article URL using ScrapingBee
-    and extracts main text using BeautifulSoup.
+    and extracts main text using BeautifulSoup, truncated to FULL_CONTENT_MAX_CHARS.
     """
     if not SCRAPINGBEE_API_KEY:
-        print("SCRAPINGBEE_API_KEY is not set. Skipping full content fetch.")
-        return None
+        return None # the handler warns once per run instead of once per article
 
-    print(f"Attempting to fetch full content for: {url}")
+    logger.debug("Attempting to fetch full content for: %s", url)
     scrapingbee_url = "https://app.scrapingbee.com/api/v1/"
     params = {
         "api_key": SCRAPINGBEE_API_KEY,
@@ -219,113 +613,248 @@ def fetch_full_article_content(url):
     }
 
     try:
-        response = requests.get(scrapingbee_url, params=params, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Stream the body and stop at SCRAPINGBEE_MAX_BODY_BYTES so oversized pages
+        # are never fully buffered.
+        with SESSION.get(scrapingbee_url, params=params, timeout=30, stream=True) as response:
+            if not response.ok:
+                logger.error("ScrapingBee response text: %s...", response.text[:500])
+            response.raise_for_status()
+            chunks = []
+            total = 0
+            for chunk in response.iter_content(65536):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= SCRAPINGBEE_MAX_BODY_BYTES:
+                    break
+        body = b''.join(chunks)[:SCRAPINGBEE_MAX_BODY_BYTES]
+
+        # Imported lazily: bs4 only matters when ScrapingBee is configured.
+        from bs4 import BeautifulSoup
+        # lxml's C parser is much faster than html.parser and handles a truncated document.
+        soup = BeautifulSoup(body, 'lxml')
         
-        main_content = soup.find('article') or soup.find('main') or soup.find(class_=re.compile("body|content|article", re.I))
+        main_content = soup.find('article') or soup.find('main') or soup.find(class_=MAIN_CONTENT_CLASS_PATTERN)
         
         if main_content:
             for script_or_style in main_content(['script', 'style']):
                 script_or_style.extract()
             text = main_content.get_text(separator='\n', strip=True)
-            print(f"Successfully fetched and extracted content for: {url[:50]}...")
-            return text
+            logger.debug("Successfully fetched and extracted content for: %s...", url[:50])
+            return text[:FULL_CONTENT_MAX_CHARS]
         else:
-            print(f"Could not find main content for: {url[:50]}... Returning raw text.")
-            return soup.get_text(separator='\n', strip=True)
+            logger.warning("Could not find main content for: %s... Returning raw text.", url[:50])
+            return soup.get_text(separator='\n', strip=True)[:FULL_CONTENT_MAX_CHARS]
 
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching full content for {url[:50]}... with ScrapingBee: {e}")
-        if response is not None:
-            print(f"ScrapingBee response text: {response.text[:500]}...")
+        logger.error("Error fetching full content for %s... with ScrapingBee: %s", url[:50], e)
         return None
     except Exception as e:
-        print(f"Error processing full content for {url[:50]}...: {e}")
+        logger.error("Error processing full content for %s...: %s", url[:50], e)
         return None
 
-def store_articles_in_supabase(all_articles):
-    """Stores unique aggregated articles into Supabase."""
+def load_seen_article_filter():
+    """
+    Downloads the Bloom filter of already-ingested articles from Supabase Storage.
+    Returns an empty filter if none exists yet or the download fails.
+    """
+    supabase = get_supabase_client()
+    if supabase is None:
+        return SeenArticleFilter()
+    try:
+        data = supabase.storage.from_(AGENT_STATE_BUCKET).download(SEEN_ARTICLES_PATH)
+        logger.info("Loaded seen-article filter (%s bytes) from Supabase Storage.", len(data))
+        return SeenArticleFilter(data=data)
+    except Exception as e:
+        logger.warning("Could not load seen-article filter, starting with an empty one: %s", e)
+        return SeenArticleFilter()
+
+def save_seen_article_filter(seen_filter):
+    """Uploads the Bloom filter of already-ingested articles to Supabase Storage."""
+    supabase = get_supabase_client()
+    if supabase is None:
+        return
+    try:
+        supabase.storage.from_(AGENT_STATE_BUCKET).upload(
+            SEEN_ARTICLES_PATH,
+            seen_filter.to_bytes(),
+            {"content-type": "application/octet-stream", "upsert": "true"}
+        )
+        logger.info("Saved seen-article filter to Supabase Storage.")
+    except Exception as e:
+        logger.error("Error saving seen-article filter to Supabase Storage: %s", e)
+
+FEED_CACHE_PATH = "feed_cache.json"
+
+def load_feed_cache():
+    """
+    Downloads the per-feed ETag / Last-Modified validators from Supabase Storage.
+    Returns an empty cache if none exists yet or the download fails.
+    """
+    supabase = get_supabase_client()
+    if supabase is None:
+        return {}
+    try:
+        data = supabase.storage.from_(AGENT_STATE_BUCKET).download(FEED_CACHE_PATH)
+        feed_cache = json.loads(data)
+        logger.info("Loaded HTTP validators for %s feeds from Supabase Storage.", len(feed_cache))
+        return feed_cache
+    except Exception as e:
+        logger.warning("Could not load feed cache, fetching all feeds in full: %s", e)
+        return {}
+
+def save_feed_cache(feed_cache):
+    """Uploads the per-feed ETag / Last-Modified validators to Supabase Storage."""
+    supabase = get_supabase_client()
+    if supabase is None:
+        return
+    try:
+        supabase.storage.from_(AGENT_STATE_BUCKET).upload(
+            FEED_CACHE_PATH,
+            json.dumps(feed_cache).encode('utf-8'),
+            {"content-type": "application/json", "upsert": "true"}
+        )
+        logger.info("Saved feed cache to Supabase Storage.")
+    except Exception as e:
+        logger.error("Error saving feed cache to Supabase Storage: %s", e)
+
+SUPABASE_UPSERT_CHUNK_SIZE = 200
+SUPABASE_UPSERT_WORKERS = 4
+
+def _content_hash(article):
+    """Returns the hex SHA-256 of an article's title and description."""
+    text = (article.title or '') + '\n' + (article.description or '')
+    return hashlib.sha256(text.encode('utf-8', 'ignore')).hexdigest()
+
+def _seen_key(canonical_url, article):
+    """
+    Returns the seen-filter key for an article: its canonical URL plus its content hash,
+    so an article whose title or description changed is upserted again.
+    """
+    return canonical_url + '\n' + _content_hash(article)
+
+def _upsert_articles_chunk(chunk):
+    """
+    Upserts one chunk of article rows and returns how many rows Supabase wrote,
+    or None on error.
+    Only the count comes back (returning='minimal' + count='exact'), not the rows themselves.
+    """
+    start = time.perf_counter()
+    try:
+        response = get_supabase_client().table('articles').upsert(
+            chunk, on_conflict='url', ignore_duplicates=False, count='exact', returning='minimal'
+        ).execute()
+        logger.debug("Upserted chunk of %s articles in %.2fs.", len(chunk), time.perf_counter() - start)
+        return response.count if response.count is not None else len(chunk)
+    except Exception as e:
+        logger.error("Error inserting chunk of %s articles into Supabase 'articles' table: %s", len(chunk), e)
+        return None
+
+def store_articles_in_supabase(all_articles, seen_filter=None):
+    """
+    Stores aggregated articles into Supabase. Expects articles already passed through
+    _deduplicate_articles (canonical-URL dedup only; near-duplicate titles are still stored).
+    If a seen-article Bloom filter is given, articles already in it (same canonical URL
+    and unchanged content) are skipped, and newly stored articles are added to it.
+    Returns the number of rows written, or None if any chunk failed to upsert.
+    """
     if not all_articles:
-        print("No articles to store in 'articles' table.")
+        logger.info("No articles to store in 'articles' table.")
+        return 0
+    if get_supabase_client() is None:
         return 0
 
-    unique_articles = {article['url']: article for article in all_articles}.values()
+    # One pass: skip already-ingested articles and build the rows, canonicalizing each URL once.
     articles_to_insert = []
+    seen_keys = []
+    skipped_count = 0
+    invalid_count = 0
+    for article in all_articles:
+        # 'url' is the upsert conflict key, so rows without a real link cannot be stored.
+        if not article.url or article.url == '#':
+            invalid_count += 1
+            continue
+        seen_key = _seen_key(_canonicalize_url(article.url), article)
+        if seen_filter is not None and seen_key in seen_filter:
+            skipped_count += 1
+            continue
 
-    for article in unique_articles:
-        parsed_datetime = _parse_date_string(article['published_date'])
-        
-        if parsed_datetime != datetime.min:
-            if parsed_datetime.tzinfo is None:
-                formatted_date = parsed_datetime.isoformat() + '+00:00'
-            else:
-                formatted_date = parsed_datetime.isoformat()
-        else:
-            formatted_date = None
-
+        parsed_datetime = _published_datetime(article)
         articles_to_insert.append({
-            "source": article.get('source'),
-            "title": article.get('title'),
-            "url": article.get('url'),
-            "description": article.get('description'),
-            "published_date": formatted_date,
-            "keywords_matched": article.get('keywords_matched', [])
+            "source": article.source,
+            "title": article.title,
+            "url": article.url,
+            "description": article.description,
+            "published_date": parsed_datetime.isoformat() if parsed_datetime != MIN_DATETIME else None,
+            "keywords_matched": article.keywords_matched
         })
+        seen_keys.append(seen_key)
 
-    if articles_to_insert:
-        try:
-            response = supabase.table('articles').upsert(articles_to_insert, on_conflict='url').execute()
-            print(f"Successfully upserted {len(response.data)} articles into 'articles' table.")
-            return len(response.data)
-        except Exception as e:
-            print(f"Error inserting into Supabase 'articles' table: {e}")
-            return 0
-    else:
+    if invalid_count:
+        logger.warning("Skipping %s articles without a URL.", invalid_count)
+    if skipped_count:
+        logger.info("Skipping %s articles already ingested on a previous run.", skipped_count)
+    if not articles_to_insert:
         return 0
 
+    chunk_starts = range(0, len(articles_to_insert), SUPABASE_UPSERT_CHUNK_SIZE)
+    chunks = [articles_to_insert[i:i + SUPABASE_UPSERT_CHUNK_SIZE] for i in chunk_starts]
+    with ThreadPoolExecutor(max_workers=SUPABASE_UPSERT_WORKERS) as executor:
+        results = list(executor.map(_upsert_articles_chunk, chunks))
+
+    stored_count = 0
+    failed_chunks = 0
+    for i, stored in zip(chunk_starts, results):
+        if stored is None:
+            failed_chunks += 1
+            continue
+        stored_count += stored
+        if seen_filter is not None:
+            for seen_key in seen_keys[i:i + SUPABASE_UPSERT_CHUNK_SIZE]:
+                seen_filter.add(seen_key)
+    if failed_chunks:
+        logger.error("%s of %s chunk(s) failed to upsert into 'articles' table.", failed_chunks, len(chunks))
+        return None
+    logger.info("Successfully upserted %s articles into 'articles' table in %s chunk(s).", stored_count, len(chunks))
+    return stored_count
+
 def analyze_and_brief_with_gemini(articles_for_analysis):
     """
     Uses Gemini to analyze articles and generate a consolidated daily briefing.
     Prioritizes full content from ScrapingBee for deeper analysis.
+    Expects articles already sorted newest first (the handler sorts once for scraping).
     """
+    model = get_gemini_model()
     if not model:
-        print("Gemini model not initialized. Skipping AI analysis.")
+        logger.warning("Gemini model not initialized. Skipping AI analysis.")
         return None
 
     if not articles_for_analysis:
-        print("No articles to analyze for the daily briefing.")
+        logger.info("No articles to analyze for the daily briefing.")
         return None
 
-    sorted_articles = sorted(
-        articles_for_analysis, 
-        key=lambda x: _parse_date_string(x.get('published_date')), 
-        reverse=True
-    )
+    # Bound the prompt: Gemini latency and billing grow with input length. The handler
+    # already limits how many articles are sent (MAX_ARTICLES_FOR_GEMINI); descriptions are trimmed here.
+    MAX_DESCRIPTION_CHARS = 500
+    sorted_articles = articles_for_analysis
     
     MAX_ARTICLES_FOR_DEEP_ANALYSIS = 3 
     articles_for_gemini_input = []
-    related_urls_for_briefing = []
 
-    print(f"Preparing input for Gemini from top {MAX_ARTICLES_FOR_DEEP_ANALYSIS} articles (using full content if available).")
+    logger.info("Preparing input for Gemini from top %s articles (using full content if available).", MAX_ARTICLES_FOR_DEEP_ANALYSIS)
 
+    # Each article block is built with a single f-string; the prompt is joined once below.
     for i, article in enumerate(sorted_articles):
-        article_copy = dict(article)
-        
-        title = article_copy.get('title', 'No Title')
-        url = article_copy.get('url', '#')
-        description = article_copy.get('description', 'No description available.')
-        full_content = article_copy.get('full_content')
+        title = article.title or 'No Title'
+        url = article.url or '#'
+        description = article.description or 'No description available.'
+        full_content = article.full_content
 
-        article_input_text = ""
         if i < MAX_ARTICLES_FOR_DEEP_ANALYSIS and full_content:
-            article_input_text = f"Title: {title}\nURL: {url}\nFull Content: {full_content[:2000]}..."
+            articles_for_gemini_input.append(f"--- Article {i+1} ---\nTitle: {title}\nURL: {url}\nFull Content: {full_content}...\n")
         else:
-            article_input_text = f"Title: {title}\nURL: {url}\nDescription: {description}"
-        
-        articles_for_gemini_input.append(f"--- Article {i+1} ---\n{article_input_text}\n")
-        related_urls_for_briefing.append(url)
+            articles_for_gemini_input.append(f"--- Article {i+1} ---\nTitle: {title}\nURL: {url}\nDescription: {description[:MAX_DESCRIPTION_CHARS]}\n")
+
+    related_urls_for_briefing = [article.url or '#' for article in sorted_articles]
 
     current_date_str = date.today().strftime('%B %d, %Y')
 
@@ -364,20 +893,20 @@ def analyze_and_brief_with_gemini(articles_for_analysis):
         "Here are the articles for your analysis:\n\n"
     )
 
-    full_prompt = persona + "\n\n" + task_instruction + "\n".join(articles_for_gemini_input)
+    full_prompt = "".join((persona, "\n\n", task_instruction, "\n".join(articles_for_gemini_input)))
 
     try:
-        print(f"Sending articles to Gemini model '{model.model_name}' for analysis...")
+        logger.info("Sending articles to Gemini model '%s' for analysis...", model.model_name)
         response = model.generate_content(full_prompt)
         briefing_text = response.text
-        print("Gemini analysis complete.")
+        logger.info("Gemini analysis complete.")
         
         briefing_data = parse_gemini_briefing(briefing_text, related_urls_for_briefing)
         briefing_data['raw_ai_response'] = briefing_text
         return briefing_data
 
     except Exception as e:
-        print(f"Error generating content with Gemini: {e}")
+        logger.error("Error generating content with Gemini: %s", e)
         return {
             "title": f"AI Briefing Error - {date.today().strftime('%Y-%m-%d')}",
             "summary_text": f"Error during AI analysis: {e}. Raw AI response might be incomplete or empty.",
@@ -388,6 +917,16 @@ def analyze_and_brief_with_gemini(articles_for_analysis):
             "raw_ai_response": f"Error: {e}\nPrompt: {full_prompt}"
         }
 
+# --- Briefing Section Patterns (compiled once at import) ---
+# One pattern finds every section header; each section's body runs up to the next header.
+BRIEFING_SECTION_HEADER_PATTERN = re.compile(
+    r"^\*\*(Briefing Title|Executive Summary|Key Developments|Strategic Implications for New Economy Canada"
+    r"|Suggested Reactions|Relevant Article URLs):\*\*[ \t]*",
+    re.MULTILINE
+)
+BULLET_PATTERN = re.compile(r'^- (.+)$', re.MULTILINE)
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
 def parse_gemini_briefing(briefing_text, related_urls):
     current_date_str = date.today().strftime('%B %d, %Y')
 
@@ -400,46 +939,35 @@ def parse_gemini_briefing(briefing_text, related_urls):
         "related_article_urls": related_urls
     }
 
-    sections = {
-        "Briefing Title": r"^\*\*Briefing Title:\*\* (.*?)$",
-        "Executive Summary": r"^\*\*Executive Summary:\*\*\s*(.*?)(?=\n\n\*\*Key Developments\*\*|$)",
-        "Key Developments": r"^\*\*Key Developments:\*\*\s*(.*?)(?=\n\n\*\*Strategic Implications\*\*|$)",
-        "Strategic Implications for New Economy Canada": r"^\*\*Strategic Implications for New Economy Canada:\*\*\s*(.*?)(?=\n\n\*\*Suggested Reactions\*\*|$)",
-        "Suggested Reactions": r"^\*\*Suggested Reactions:\*\*\s*(.*?)(?=\n\n\*\*Relevant Article URLs\*\*|$)",
-    }
+    # Single pass over the text: slice out each section between consecutive headers.
+    sections = {}
+    headers = list(BRIEFING_SECTION_HEADER_PATTERN.finditer(briefing_text))
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        body_end = next_header.start() if next_header else len(briefing_text)
+        sections.setdefault(header.group(1), briefing_text[header.end():body_end].strip())
 
-    title_match = re.search(sections["Briefing Title"], briefing_text, re.MULTILINE)
-    if title_match:
-        extracted_title = title_match.group(1).strip()
-        if re.search(r'\d{4}-\d{2}-\d{2}', extracted_title) or "Today's Date" in extracted_title or "October 26, 2023" in extracted_title:
+    extracted_title = sections.get("Briefing Title", "").split('\n', 1)[0].strip()
+    if extracted_title:
+        if ISO_DATE_PATTERN.search(extracted_title) or "Today's Date" in extracted_title or "October 26, 2023" in extracted_title:
             parsed_data["title"] = f"AI Morning Briefing - {current_date_str}"
         else:
             parsed_data["title"] = extracted_title
-    
-    summary_match = re.search(sections["Executive Summary"], briefing_text, re.DOTALL | re.MULTILINE)
-    if summary_match:
-        parsed_data["summary_text"] = summary_match.group(1).strip()
-
-    dev_match = re.search(sections["Key Developments"], briefing_text, re.DOTALL | re.MULTILINE)
-    if dev_match:
-        dev_text = dev_match.group(1)
-        parsed_data["key_developments"] = [item.strip() for item in re.findall(r'^- (.+)$', dev_text, re.MULTILINE)]
-    
-    imp_match = re.search(sections["Strategic Implications for New Economy Canada"], briefing_text, re.DOTALL | re.MULTILINE)
-    if imp_match:
-        parsed_data["strategic_implications"] = imp_match.group(1).strip()
 
-    react_match = re.search(sections["Suggested Reactions"], briefing_text, re.DOTALL | re.MULTILINE)
-    if react_match:
-        parsed_data["suggested_reactions"] = react_match.group(1).strip()
+    parsed_data["summary_text"] = sections.get("Executive Summary", "")
+    parsed_data["key_developments"] = [item.strip() for item in BULLET_PATTERN.findall(sections.get("Key Developments", ""))]
+    parsed_data["strategic_implications"] = sections.get("Strategic Implications for New Economy Canada", "")
+    parsed_data["suggested_reactions"] = sections.get("Suggested Reactions", "")
 
     return parsed_data
 
 def store_briefing_in_supabase(briefing_data):
     """Stores the AI-generated briefing into the 'daily_briefings' table."""
     if not briefing_data:
-        print("No briefing data to store.")
+        logger.info("No briefing data to store.")
         return "No briefing processed."
+    supabase = get_supabase_client()
+    if supabase is None:
+        return "Supabase is not configured; briefing not stored."
 
     briefing_to_insert = {
         "briefing_date": date.today().isoformat(),
@@ -453,15 +981,16 @@ def store_briefing_in_supabase(briefing_data):
     }
 
     try:
-        response = supabase.table('daily_briefings').upsert(
-            briefing_to_insert, 
-            on_conflict='briefing_date'
+        supabase.table('daily_briefings').upsert(
+            briefing_to_insert,
+            on_conflict='briefing_date',
+            returning='minimal'
         ).execute()
-        
-        print(f"Successfully stored/updated daily briefing in Supabase: {response.data}")
+
+        logger.info("Successfully stored/updated daily briefing '%s' in Supabase.", briefing_to_insert["title"])
         return "Daily briefing stored successfully."
     except Exception as e:
-        print(f"Error storing daily briefing in Supabase: {e}")
+        logger.error("Error storing daily briefing in Supabase: %s", e)
         return f"Error storing daily briefing: {e}"
 
 def handler(request):
@@ -469,45 +998,55 @@ def handler(request):
     Main handler for the GitHub Actions workflow.
     Fetches news, stores individual articles, then generates and stores a daily briefing.
     """
-    print("Starting AI News Agent (with Brain)...")
+    logger.info("Starting AI News Agent (with Brain)...")
     
-    # 1. Fetch articles from RSS feeds
-    rss_articles = fetch_articles_from_rss()
-
-    # 2. Fetch articles from News API (supplementary)
-    newsapi_articles = fetch_articles_from_newsapi() 
+    # 1. Fetch articles from RSS feeds (conditional GET against last run's validators)
+    #    and, concurrently, from News API (supplementary)
+    feed_cache = load_feed_cache()
+    rss_articles, newsapi_articles = asyncio.run(fetch_all_articles(feed_cache))
     
-    # 3. Combine all fetched articles and deduplicate
-    all_fetched_articles = rss_articles + newsapi_articles
+    # 2. Combine all fetched articles and drop canonical-URL duplicates; every distinct URL
+    #    is stored. Near-duplicate titles are collapsed only for scraping and the briefing.
+    unique_articles = _deduplicate_articles(rss_articles + newsapi_articles)
+    briefing_candidates = _collapse_near_duplicates(unique_articles)
     
-    # 4. Fetch full content for a limited number of top articles
+    # 3. Fetch full content for a limited number of top articles
     # Sort them by date to get the most recent for full content.
-    sorted_articles = sorted(
-        all_fetched_articles,
-        key=lambda x: _parse_date_string(x.get('published_date')),
-        reverse=True
-    )
+    sorted_articles = _sort_by_published_date(briefing_candidates)
     
     articles_with_full_content = []
     MAX_SCRAPINGBEE_CALLS = 3 
     MAX_ARTICLES_FOR_GEMINI = 3
 
-    for i, article in enumerate(sorted_articles):
-        article_copy = dict(article) 
-        if i < MAX_SCRAPINGBEE_CALLS:
-            full_text = fetch_full_article_content(article_copy['url'])
-            if full_text:
-                article_copy['full_content'] = full_text
-        articles_with_full_content.append(article_copy)
+    # The ScrapingBee calls are independent multi-second round-trips, so overlap them.
+    articles_to_scrape = sorted_articles[:MAX_SCRAPINGBEE_CALLS]
+    if not SCRAPINGBEE_API_KEY:
+        logger.warning("SCRAPINGBEE_API_KEY is not set. Skipping full content fetch.")
+        articles_to_scrape = []
+    with ThreadPoolExecutor(max_workers=MAX_SCRAPINGBEE_CALLS) as executor:
+        full_texts = list(executor.map(fetch_full_article_content, [article.url for article in articles_to_scrape]))
+
+    for article, full_text in zip(articles_to_scrape, full_texts):
+        articles_with_full_content.append(replace(article, full_content=full_text) if full_text else article)
+    articles_with_full_content.extend(sorted_articles[len(articles_to_scrape):])
 
     articles_for_gemini_analysis = articles_with_full_content[:MAX_ARTICLES_FOR_GEMINI]
 
-    # 5. Store individual articles in the 'articles' table (for historical record/raw data)
-    articles_stored_count = store_articles_in_supabase(all_fetched_articles) 
-    print(f"Stored {articles_stored_count} unique articles in 'articles' table.")
+    # 4. Store individual articles in the 'articles' table (for historical record/raw data)
+    seen_filter = load_seen_article_filter()
+    articles_stored_count = store_articles_in_supabase(unique_articles, seen_filter)
+    if articles_stored_count is None:
+        # Keep last run's feed validators so the next run re-fetches (rather than gets 304 for)
+        # the feeds whose articles did not make it into the table.
+        logger.error("Article storage failed; feed cache not updated so these items are fetched again.")
+    else:
+        save_feed_cache(feed_cache)
+        if articles_stored_count:
+            save_seen_article_filter(seen_filter)
+        logger.info("Stored %s new unique articles in 'articles' table.", articles_stored_count)
 
-    # 6. Analyze articles with Gemini to create the daily briefing
-    if model:
+    # 5. Analyze articles with Gemini to create the daily briefing
+    if get_gemini_model():
         briefing_data = analyze_and_brief_with_gemini(articles_for_gemini_analysis)
         briefing_result = store_briefing_in_supabase(briefing_data)
     else:
@@ -517,15 +1056,24 @@ def handler(request):
             "key_developments": [],
             "strategic_implications": "AI analysis skipped.",
             "suggested_reactions": "Check Gemini API key and model availability.",
-            "related_article_urls": [a.get('url', '#') for a in all_fetched_articles],
+            "related_article_urls": [a.url or '#' for a in briefing_candidates],
             "raw_ai_response": "Model initialization failed."
         }
         briefing_result = store_briefing_in_supabase(error_briefing)
-        print(f"Gemini model could not be initialized, skipping AI analysis. Briefing storage status: {briefing_result}")
+        logger.warning("Gemini model could not be initialized, skipping AI analysis. Briefing storage status: %s", briefing_result)
 
 
-    print(f"Full run complete. Briefing storage status: {briefing_result}")
+    logger.info("Full run complete. Briefing storage status: %s", briefing_result)
     return f"AI Agent run completed. Articles: {articles_stored_count}, Briefing: {briefing_result}"
 
 if __name__ == "__main__":
+    # INFO by default rather than WARNING: the GitHub Actions log is the only record of a run.
+    # LOG_LEVEL overrides it; an unknown level name falls back to INFO instead of failing startup.
+    log_level_name = (os.environ.get("LOG_LEVEL") or "INFO").upper()
+    log_level = logging.getLevelName(log_level_name)
+    if not isinstance(log_level, int):
+        log_level = logging.INFO
+    logging.basicConfig(level=log_level, format="%(asctime)s %(levelname)s %(message)s")
+    if log_level_name != logging.getLevelName(log_level):
+        logger.warning("Unknown LOG_LEVEL '%s', using INFO.", log_level_name)
     print(handler(None))
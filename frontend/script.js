@@ -17,6 +17,33 @@ const newsContainer = document.getElementById('news-container');
 const briefingContainer = document.getElementById('briefing-content');
 const sortOrderSelect = document.getElementById('sortOrder');
 
+// Escapes text for safe interpolation into HTML element content and quoted attributes.
+function escapeHtml(value) {
+    return String(value ?? '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+// Returns the URL if it is an absolute http(s) link, else '#'. Escaping alone does not
+// stop "javascript:" (or other scheme) links from feeds or Gemini output running on click.
+function safeHref(url) {
+    try {
+        const protocol = new URL(url).protocol;
+        return protocol === 'http:' || protocol === 'https:' ? url : '#';
+    } catch (e) {
+        return '#';
+    }
+}
+
+// Feed descriptions often carry HTML markup; reduce them to plain text.
+// DOMParser documents are inert, so no scripts or image loads are triggered.
+function htmlToText(html) {
+    return new DOMParser().parseFromString(html, 'text/html').body.textContent || '';
+}
+
 async function fetchDailyBriefing() {
     briefingContainer.innerHTML = '<p>Loading daily briefing...</p>';
     const today = new Date().toISOString().split('T')[0]; // Get today's date in YYYY-MM-DD format
@@ -41,34 +68,36 @@ async function fetchDailyBriefing() {
 }
 
 function renderBriefing(briefing) {
-    let briefingHtml = `<h3>${briefing.title || "AI Morning Briefing"}</h3>`;
-    briefingHtml += `<p><strong>Executive Summary:</strong> ${briefing.summary_text || 'No summary available.'}</p>`;
+    const parts = [
+        `<h3>${escapeHtml(briefing.title || "AI Morning Briefing")}</h3>`,
+        `<p><strong>Executive Summary:</strong> ${escapeHtml(briefing.summary_text || 'No summary available.')}</p>`
+    ];
 
     if (briefing.key_developments && briefing.key_developments.length > 0) {
-        briefingHtml += `<h3>Key Developments:</h3><ul>`;
+        parts.push(`<h3>Key Developments:</h3><ul>`);
         briefing.key_developments.forEach(item => {
-            briefingHtml += `<li>${item}</li>`;
+            parts.push(`<li>${escapeHtml(item)}</li>`);
         });
-        briefingHtml += `</ul>`;
+        parts.push(`</ul>`);
     }
 
     if (briefing.strategic_implications) {
-        briefingHtml += `<h3>Strategic Implications for New Economy Canada:</h3><p>${briefing.strategic_implications}</p>`;
+        parts.push(`<h3>Strategic Implications for New Economy Canada:</h3><p>${escapeHtml(briefing.strategic_implications)}</p>`);
     }
 
     if (briefing.suggested_reactions) {
-        briefingHtml += `<h3>Suggested Reactions:</h3><p>${briefing.suggested_reactions}</p>`;
+        parts.push(`<h3>Suggested Reactions:</h3><p>${escapeHtml(briefing.suggested_reactions)}</p>`);
     }
 
     if (briefing.related_article_urls && briefing.related_article_urls.length > 0) {
-        briefingHtml += `<h3>Relevant Article URLs:</h3><ul>`;
+        parts.push(`<h3>Relevant Article URLs:</h3><ul>`);
         briefing.related_article_urls.forEach(url => {
-            briefingHtml += `<li><a href="${url}" target="_blank">${url}</a></li>`;
+            parts.push(`<li><a href="${escapeHtml(safeHref(url))}" target="_blank" rel="noopener noreferrer">${escapeHtml(url)}</a></li>`);
         });
-        briefingHtml += `</ul>`;
+        parts.push(`</ul>`);
     }
     
-    briefingContainer.innerHTML = briefingHtml;
+    briefingContainer.innerHTML = parts.join('');
 }
 
 
@@ -92,6 +121,33 @@ async function fetchAndRenderAggregatedNews() {
     renderAggregatedNews(articles);
 }
 
+const NEWS_RENDER_BATCH_SIZE = 25;
+let currentNewsRenderId = 0;
+
+function renderNewsCard(article) {
+    const articleDate = article.published_date ? new Date(article.published_date).toLocaleDateString(undefined, {
+        year: 'numeric', month: 'long', day: 'numeric', hour: '2-digit', minute: '2-digit'
+    }) : 'N/A';
+
+    const keywordsHtml = article.keywords_matched && article.keywords_matched.length > 0
+        ? article.keywords_matched.map(keyword => `<span>${escapeHtml(keyword)}</span>`).join('')
+        : '';
+
+    const description = article.description ? htmlToText(article.description) : 'No description available.';
+
+    return `
+        <div class="news-card">
+            <h2><a href="${escapeHtml(safeHref(article.url))}" target="_blank" rel="noopener noreferrer">${escapeHtml(article.title)}</a></h2>
+            <p class="news-meta">
+                <span><strong>Source:</strong> ${escapeHtml(article.source || 'Unknown')}</span>
+                <span><strong>Published:</strong> ${escapeHtml(articleDate)}</span>
+            </p>
+            <p class="news-description">${escapeHtml(description)}</p>
+            <div class="news-keywords">${keywordsHtml}</div>
+        </div>
+    `;
+}
+
 function renderAggregatedNews(articles) {
     const sortOrder = sortOrderSelect.value;
     let sortedArticles = [...articles]; 
@@ -118,30 +174,23 @@ function renderAggregatedNews(articles) {
             break;
     }
 
-    newsContainer.innerHTML = ''; 
-
-    sortedArticles.forEach(article => {
-        const articleDate = article.published_date ? new Date(article.published_date).toLocaleDateString(undefined, {
-            year: 'numeric', month: 'long', day: 'numeric', hour: '2-digit', minute: '2-digit'
-        }) : 'N/A';
-
-        const keywordsHtml = article.keywords_matched && article.keywords_matched.length > 0
-            ? article.keywords_matched.map(keyword => `<span>${keyword}</span>`).join('')
-            : '';
-
-        const newsCard = `
-            <div class="news-card">
-                <h2><a href="${article.url}" target="_blank">${article.title}</a></h2>
-                <p class="news-meta">
-                    <span><strong>Source:</strong> ${article.source || 'Unknown'}</span>
-                    <span><strong>Published:</strong> ${articleDate}</span>
-                </p>
-                <p class="news-description">${article.description || 'No description available.'}</p>
-                <div class="news-keywords">${keywordsHtml}</div>
-            </div>
-        `;
-        newsContainer.innerHTML += newsCard;
-    });
+    // Cards are rendered in batches, one batch per animation frame, so the first
+    // articles appear immediately and a long list never blocks the page. Each batch
+    // is a single insertAdjacentHTML call, so the container is never re-parsed.
+    const renderId = ++currentNewsRenderId;
+    newsContainer.innerHTML = '';
+
+    function renderBatch(start) {
+        if (renderId !== currentNewsRenderId) {
+            return; // a newer render (e.g. after a sort change) has taken over
+        }
+        const batch = sortedArticles.slice(start, start + NEWS_RENDER_BATCH_SIZE);
+        newsContainer.insertAdjacentHTML('beforeend', batch.map(renderNewsCard).join(''));
+        if (start + NEWS_RENDER_BATCH_SIZE < sortedArticles.length) {
+            requestAnimationFrame(() => renderBatch(start + NEWS_RENDER_BATCH_SIZE));
+        }
+    }
+    renderBatch(0);
 }
 
 // Event listener for sorting